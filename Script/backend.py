@@ -2,17 +2,30 @@
 import sys
 import os
 import re
-import tempfile
-import shutil
-from datetime import datetime
+import asyncio
+import functools
+import glob
+import operator
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+# Keep BLAS single-threaded so the per-device process pool
+# below doesn't oversubscribe the cores
+os.environ.setdefault("OMP_NUM_THREADS", "1")
 
 # === Third-party ===
+import aiofiles.os
+import aiofiles.tempfile
+import aiohttp
+import orjson
 import pandas as pd
-import requests
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
 import whisper
 from fastapi import FastAPI, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import FileResponse, JSONResponse
 
 from cycle_detection import CycleDetectionApp
 from solar_production_simulation import SolarProductionSimulation
@@ -21,7 +34,7 @@ from devices import DeviceDetector
 from pattern import PatternAnalyzer
 from recommendations import RecommendationCalculator
 from recommendation_trainer import RecommendationModelTrainer
-from models import CommandRequest, Recommendation
+from models import AIResponse, CommandRequest
 
 # === Path fix for imports ===
 sys.path.append(
@@ -42,7 +55,20 @@ app.add_middleware(
 
 manager = CommandHistoryManager()
 detector = DeviceDetector()
-model_whisper = whisper.load_model("base")
+
+# Whisper weighs ~140 MB; load it on the first /transcribe call
+# instead of at import so worker start-up stays fast
+_whisper_lock = threading.Lock()
+_whisper = None
+
+
+def get_whisper():
+    global _whisper
+    if _whisper is None:
+        with _whisper_lock:
+            if _whisper is None:
+                _whisper = whisper.load_model("base")
+    return _whisper
 
 BASE_PATH = os.path.normpath(
     os.path.join(
@@ -53,20 +79,52 @@ BASE_PATH = os.path.normpath(
 )
 
 
+_NORM_RE = re.compile(r"[^\w\s]")
+
+
+@functools.lru_cache(maxsize=1024)
 def normalize_command(text: str) -> str:
-    return re.sub(r"[^\w\s]", "", text.lower()).strip()
+    return _NORM_RE.sub("", text.lower()).strip()
+
+
+# Feast dates are deterministic, so years generated offline with
+# generate_feast_table.py resolve without any network traffic
+_FEASTS: set[str] = set()
+_FEAST_YEARS: set[int] = set()
+for _path in sorted(
+    glob.glob(os.path.join(BASE_PATH, "orthodox_feasts_*.json"))
+):
+    try:
+        with open(_path, "rb") as _f:
+            _FEASTS.update(orjson.loads(_f.read()))
+        _FEAST_YEARS.add(int(os.path.basename(_path)[-9:-5]))
+    except Exception as _e:
+        print(f"[Holiday] Error loading feast table {_path}: {_e}")
 
 
 def is_orthodox_holiday(date_str: str) -> bool:
+    """O(1) membership check in the precomputed feast table."""
+    return date_str in _FEASTS
+
+
+# Holiday answers never change for a given date, so cache them in memory
+_holiday_cache: dict[str, bool] = {}
+
+
+async def _fetch_holiday(
+    session: aiohttp.ClientSession,
+    date_str: str
+) -> bool | None:
     try:
         year, month, day = map(int, date_str.split("-"))
         url = f"https://orthocal.info/api/gregorian/{year}/{month}/{day}"
-        r = requests.get(url, timeout=5)
-        js = r.json()
+        async with session.get(url) as r:
+            js = await r.json()
         return bool(js.get("feasts"))
     except Exception as e:
         print(f"[Holiday] Error for {date_str}: {e}")
-        return False
+        # None = lookup failed; the caller must not cache it
+        return None
 
 
 def detect_and_save_devices(command: str) -> list[str]:
@@ -90,10 +148,12 @@ def run_detection(device: str):
 def run_detections_and_trainings(devices: list[str]):
     permanent = ["fridge", "freezer", "boiler"]
     all_devices = devices + permanent
-    for d in all_devices:
-        run_detection(d)
-    for d in devices:
-        train_model(d)
+    max_workers = min(len(all_devices), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers) as ex:
+        # Devices are independent; detect everywhere first, then
+        # train on the freshly written cycle files
+        list(ex.map(run_detection, all_devices))
+        list(ex.map(train_model, devices))
 
 
 def train_model(device: str):
@@ -114,42 +174,112 @@ def calculate_recommendations(devices: list[str]):
 
 
 def sort_recommendations(recommendations: list[dict]) -> list[dict]:
+    # date/time are fixed-width ISO strings (YYYY-MM-DD, HH:MM),
+    # so they sort correctly without parsing datetimes
     return sorted(
         recommendations,
-        key=lambda x: datetime.strptime(
-            f"{x['date']} {x['time']}",
-            "%Y-%m-%d %H:%M"
-        )
+        key=operator.itemgetter("date", "time")
     )
 
 
-def mark_holidays(recommendations: list[dict]):
+async def mark_holidays(recommendations: list[dict]):
+    unique_dates = {r["date"] for r in recommendations}
+    # Only dates outside the offline feast tables go to the network
+    missing = [
+        d for d in unique_dates
+        if d not in _holiday_cache and int(d[:4]) not in _FEAST_YEARS
+    ]
+    fetched: dict[str, bool | None] = {}
+    if missing:
+        timeout = aiohttp.ClientTimeout(total=5)
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            results = await asyncio.gather(
+                *[_fetch_holiday(session, d) for d in missing]
+            )
+        fetched = dict(zip(missing, results))
+        # Only successful lookups go into the cache; a failed fetch
+        # must be retried on the next request, not remembered
+        _holiday_cache.update(
+            (d, ok) for d, ok in fetched.items() if ok is not None
+        )
     for r in recommendations:
-        r["holiday"] = is_orthodox_holiday(r["date"])
+        date_str = r["date"]
+        if int(date_str[:4]) in _FEAST_YEARS:
+            r["holiday"] = is_orthodox_holiday(date_str)
+        else:
+            r["holiday"] = bool(
+                _holiday_cache.get(date_str, fetched.get(date_str))
+            )
+
+
+# Cache keyed on (path, mtime): the CSV only re-parses after
+# /generate_solar_production rewrites it
+@functools.lru_cache(maxsize=32)
+def _read_csv_cached(path: str, mtime: float) -> pd.DataFrame:
+    return pd.read_csv(path, parse_dates=["time"])
 
 
 def load_solar_production() -> pd.DataFrame:
     path = os.path.join(BASE_PATH, "solar_production_hourly.csv")
-    return pd.read_csv(path, parse_dates=["time"])
+    return _read_csv_cached(path, os.path.getmtime(path))
+
+
+@functools.lru_cache(maxsize=4)
+def _solar_payload_cached(path: str, mtime: float) -> dict | None:
+    """Parse the hourly CSV with Arrow and build the response payload."""
+    tbl = pacsv.read_csv(
+        path,
+        convert_options=pacsv.ConvertOptions(
+            column_types={"time": pa.timestamp("s")}
+        )
+    )
+    if (
+        tbl.num_rows == 0 or
+        "time" not in tbl.column_names or
+        "energy_kwh" not in tbl.column_names
+    ):
+        return None
+    tbl = tbl.sort_by("time")
+    return {
+        "status": "ok",
+        "hours": pc.strftime(
+            tbl["time"], format="%Y-%m-%d %H:%M"
+        ).to_pylist(),
+        "values": pc.round(tbl["energy_kwh"], 2).to_pylist()
+    }
+
+
+def _solar_json_path() -> str:
+    return os.path.join(BASE_PATH, "solar_production_hourly.json")
+
+
+def _refresh_solar_json(csv_path: str, json_path: str) -> bool:
+    """Serialize the /solar_production payload once per CSV rewrite."""
+    payload = _solar_payload_cached(csv_path, os.path.getmtime(csv_path))
+    if payload is None:
+        return False
+    with open(json_path, "wb") as f:
+        f.write(orjson.dumps(payload))
+    return True
 
 
 # === FastAPI endpoints ===
 
-@app.post("/ai")
-def ai_command(request: CommandRequest):
+@app.post("/ai", response_model=AIResponse)
+async def ai_command(request: CommandRequest):
     try:
         devices = detect_and_save_devices(request.command)
         if not devices:
-            return {
+            return JSONResponse({
                 "error": (
                     f"Unknown device in command: "
                     f"'{request.command}'"
                 )
-            }
+            })
 
         all_devices = devices + ["fridge", "freezer", "boiler"]
-        run_detections_and_trainings(devices)
-        analyzer = analyze_patterns(all_devices)
+        await asyncio.to_thread(run_detections_and_trainings, devices)
+        analyzer = await asyncio.to_thread(analyze_patterns, all_devices)
         summary = analyzer.get_pattern_summary()
 
         # Use English summary keys
@@ -157,9 +287,11 @@ def ai_command(request: CommandRequest):
         statistics = summary.get("statistics", {})
         error_messages = summary.get("error_messages", {})
 
-        results, threshold = calculate_recommendations(devices)
+        results, threshold = await asyncio.to_thread(
+            calculate_recommendations, devices
+        )
         results = sort_recommendations(results)
-        mark_holidays(results)
+        await mark_holidays(results)
 
         filtered_statistics = {
             d: statistics[d]
@@ -167,59 +299,56 @@ def ai_command(request: CommandRequest):
             if d in statistics
         }
 
-        return {
-            "recommendations": [Recommendation(**r).dict() for r in results],
-            "devices": devices,
-            "patterns_per_day": patterns_per_day,
-            "statistics": filtered_statistics,
-            "error_messages": error_messages,
-            "bonus_threshold": round(threshold, 2)
-        }
+        # FastAPI validates the raw dicts once through the response
+        # model; no per-item Recommendation round-trip needed
+        return AIResponse(
+            recommendations=results,
+            devices=devices,
+            patterns_per_day=patterns_per_day,
+            statistics=filtered_statistics,
+            error_messages=error_messages,
+            bonus_threshold=round(threshold, 2)
+        )
 
     except Exception as e:
         print(f"❗ Error processing command: {e}")
-        return {"error": f"Internal error: {str(e)}"}
+        return JSONResponse({"error": f"Internal error: {str(e)}"})
 
 
 @app.get("/commands")
 def get_commands():
-    return {"commands": [rec.dict() for rec in manager.load_commands()]}
+    return {"commands": manager.load_commands()}
 
 
 @app.get("/solar_production")
-def solar_production():
+async def solar_production():
     try:
         path = os.path.join(BASE_PATH, "solar_production_hourly.csv")
 
         if not os.path.exists(path):
             return {"error": "CSV file does not exist."}
 
-        df = pd.read_csv(path, parse_dates=["time"])
-
+        # Serve the JSON rendered at generation time; rebuild it
+        # only when the CSV is newer
+        json_path = _solar_json_path()
         if (
-            df.empty or
-            "time" not in df.columns or
-            "energy_kwh" not in df.columns
+            not os.path.exists(json_path)
+            or os.path.getmtime(json_path) < os.path.getmtime(path)
         ):
-            return {"error": "File does not contain valid data."}
-
-        return JSONResponse({
-            "status": "ok",
-            "hours": (
-                df.sort_values("time")["time"]
-                .dt.strftime("%Y-%m-%d %H:%M").tolist()
-            ),
-            "values": (
-                df["energy_kwh"].round(2).tolist()
+            ok = await asyncio.to_thread(
+                _refresh_solar_json, path, json_path
             )
-        })
+            if not ok:
+                return {"error": "File does not contain valid data."}
+
+        return FileResponse(json_path, media_type="application/json")
 
     except Exception as e:
         return {"error": f"Read error: {e}"}
 
 
 @app.get("/generate_solar_production")
-def generate_solar_production():
+async def generate_solar_production():
     try:
         simulation = SolarProductionSimulation(
             latitude=46.798833,
@@ -232,7 +361,10 @@ def generate_solar_production():
             num_panels=12,
             output_csv=os.path.join(BASE_PATH, "solar_production_hourly.csv")
         )
-        simulation.run()
+        await asyncio.to_thread(simulation.run)
+        await asyncio.to_thread(
+            _refresh_solar_json, simulation.output_csv, _solar_json_path()
+        )
         return {"status": "ok"}
     except Exception as e:
         return {"error": f"Simulation error: {str(e)}"}
@@ -241,11 +373,31 @@ def generate_solar_production():
 @app.post("/transcribe")
 async def transcribe(file: UploadFile = File(...)):
     try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".webm") as tmp:
-            shutil.copyfileobj(file.file, tmp)
+        async with aiofiles.tempfile.NamedTemporaryFile(
+            "wb", suffix=".webm", delete=False
+        ) as tmp:
+            # Stream in 1 MiB chunks so large uploads never
+            # buffer fully in memory or block the event loop
+            while chunk := await file.read(1 << 20):
+                await tmp.write(chunk)
             path = tmp.name
-        result = model_whisper.transcribe(path, language="en")
-        os.remove(path)
+        result = await asyncio.to_thread(
+            lambda: get_whisper().transcribe(path, language="en")
+        )
+        await aiofiles.os.remove(path)
         return {"text": result["text"]}
     except Exception as e:
         return {"error": f"Transcription error: {e}"}
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(
+        "backend:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=4,
+        loop="uvloop",
+        http="httptools"
+    )
@@ -2,6 +2,7 @@ import os
 import sys
 import json
 import pandas as pd
+import polars as pl
 
 # Thresholds for each device
 DEVICE_THRESHOLDS = {
@@ -43,76 +44,76 @@ class DataFrameLoader:
     def __init__(self, filepath: str):
         self.filepath = filepath
 
-    def load(self) -> pd.DataFrame:
-        df = pd.read_csv(self.filepath, parse_dates=["timestamp"])
-        if "in_cycle" not in df.columns:
+    def load(self) -> pl.LazyFrame:
+        lf = pl.scan_csv(self.filepath, try_parse_dates=True)
+        columns = lf.collect_schema().names()
+        if "in_cycle" not in columns:
             raise ValueError("Column 'in_cycle' does not exist in file!")
-        df["in_cycle"] = df["in_cycle"].astype(int)
-        return df
+        if "energy_consumed_kwh" not in columns:
+            lf = lf.with_columns(
+                pl.lit(0.0).alias("energy_consumed_kwh")
+            )
+        return lf.with_columns(pl.col("in_cycle").cast(pl.Int8))
 
 
 class CycleProcessor:
     def __init__(self, thresholds: dict):
         self.thresholds = thresholds
-        self.in_cycle = False
-        self.start_time = None
-        self.total_energy = 0.0
-        self.results = []
-
-    def process_row(self, row: pd.Series):
-        pred = row["in_cycle"]
-        energy = row.get("energy_consumed_kwh", 0.0) or 0.0
-
-        if not self.in_cycle and pred == 1:
-            self._start_cycle(row["timestamp"], energy)
-        elif self.in_cycle and pred == 1:
-            self._continue_cycle(energy)
-        elif self.in_cycle and pred == 0:
-            self._end_cycle(row["timestamp"])
-
-    def _start_cycle(self, timestamp, energy):
-        self.in_cycle = True
-        self.start_time = timestamp
-        self.total_energy = energy
-
-    def _continue_cycle(self, energy):
-        self.total_energy += energy
-
-    def _end_cycle(self, timestamp):
-        duration = (timestamp - self.start_time).total_seconds() / 60
-        if (
-            duration >= self.thresholds["min_duration"]
-            and self.total_energy >= self.thresholds["min_energy"]
-        ):
-            self.results.append({
-                "start": self.start_time,
-                "stop": timestamp,
-                "duration_min": round(duration, 1),
-                "energy_kwh": round(self.total_energy, 3)
-            })
-        self._reset_cycle()
-
-    def _reset_cycle(self):
-        self.in_cycle = False
-        self.start_time = None
-        self.total_energy = 0.0
-
-    def get_results(self) -> pd.DataFrame:
-        return pd.DataFrame(self.results)
+        self.results = pl.DataFrame()
+
+    def process_frame(self, lf: pl.LazyFrame):
+        """Detect cycles with a run-length encoding fused into one plan."""
+        self.results = (
+            lf.with_columns(
+                pl.col("energy_consumed_kwh").fill_null(0.0),
+                # A new cycle starts wherever in_cycle flips to 1
+                (pl.col("in_cycle").diff().fill_null(pl.col("in_cycle")) == 1)
+                .cum_sum()
+                .alias("cycle_id"),
+                pl.col("timestamp").shift(-1).alias("next_time"),
+            )
+            .filter(pl.col("in_cycle") == 1)
+            .group_by("cycle_id", maintain_order=True)
+            .agg(
+                pl.col("timestamp").first().alias("start"),
+                # A cycle only ends on an explicit in_cycle == 0 row,
+                # so the stop is the timestamp right after the run
+                pl.col("next_time").last().alias("stop"),
+                pl.col("energy_consumed_kwh").sum().alias("energy_kwh"),
+            )
+            .drop_nulls("stop")
+            .with_columns(
+                ((pl.col("stop") - pl.col("start")).dt.total_seconds() / 60)
+                .alias("duration_min")
+            )
+            .filter(
+                (pl.col("duration_min") >= self.thresholds["min_duration"])
+                & (pl.col("energy_kwh") >= self.thresholds["min_energy"])
+            )
+            .select(
+                pl.col("start"),
+                pl.col("stop"),
+                pl.col("duration_min").round(1),
+                pl.col("energy_kwh").round(3),
+            )
+            .collect()
+        )
+
+    def get_results(self) -> pl.DataFrame:
+        return self.results
 
 
 class StatisticsCalculator:
     def __init__(self, device: str):
         self.device = device
 
-    def calculate(self, df: pd.DataFrame) -> dict:
-        return {
-            self.device: {
-                "avg_duration_min": round(df["duration_min"].mean(), 1),
-                "avg_energy_kwh": round(df["energy_kwh"].mean(), 3),
-                "cycle_count": len(df)
-            }
-        }
+    def calculate(self, df: pl.DataFrame) -> dict:
+        stats = df.select(
+            pl.col("duration_min").mean().round(1).alias("avg_duration_min"),
+            pl.col("energy_kwh").mean().round(3).alias("avg_energy_kwh"),
+            pl.len().alias("cycle_count")
+        ).row(0, named=True)
+        return {self.device: stats}
 
 
 class ResultsWriter:
@@ -138,19 +139,20 @@ class CycleDetectionApp:
 
         device = self.paths.get_device_name()
         thresholds = ThresholdProvider(device).get_thresholds()
-        df = DataFrameLoader(self.filepath).load()
+        lf = DataFrameLoader(self.filepath).load()
 
         processor = CycleProcessor(thresholds)
-        for _, row in df.iterrows():
-            processor.process_row(row)
+        processor.process_frame(lf)
 
         results_df = processor.get_results()
+        # Hand pandas to ResultsWriter so downstream consumers
+        # of the CSV/JSON outputs are unaffected
         ResultsWriter(
             self.paths.get_output_csv_path(),
             self.paths.get_output_json_path()
-        ).write_csv(results_df)
+        ).write_csv(results_df.to_pandas())
 
-        if not results_df.empty:
+        if not results_df.is_empty():
             statistics = StatisticsCalculator(device).calculate(results_df)
             ResultsWriter(
                 self.paths.get_output_csv_path(),
@@ -1,6 +1,9 @@
-import spacy
-from spacy.matcher import PhraseMatcher
-from typing import List
+import functools
+import re
+import ahocorasick
+from typing import List, Tuple
+
+_WORD_RE = re.compile(r"\w")
 
 
 class DeviceDetector:
@@ -49,35 +52,37 @@ class DeviceDetector:
             "clean the dishes", "could you clean dishes",
             "dishwasher please"
         ]
-        # Initialize spaCy model
-        try:
-            self.nlp = spacy.load("en_core_web_sm")
-        except OSError:
-            self.nlp = spacy.blank("en")
-        # Create PhraseMatcher for multi-word patterns
-        self.matcher = PhraseMatcher(self.nlp.vocab, attr="LOWER")
-        self._init_matcher()
+        # Compile every keyword into one Aho-Corasick automaton:
+        # detection is then a single linear scan of the input,
+        # independent of how many patterns are registered
+        self.automaton = ahocorasick.Automaton()
+        self._init_automaton()
+        # Detection is a pure function of the text, so repeat
+        # commands can skip the automaton walk entirely
+        self._detect_cached = functools.lru_cache(maxsize=2048)(
+            self._detect
+        )
 
-    def _init_matcher(self):
-        patterns_wash = [
-            self.nlp.make_doc(text)
-            for text in self.washing_keywords
-        ]
-        patterns_dish = [
-            self.nlp.make_doc(text)
-            for text in self.dishwasher_keywords
-        ]
-        self.matcher.add("WASHING_MACHINE", patterns_wash)
-        self.matcher.add("DISHWASHER", patterns_dish)
+    def _init_automaton(self):
+        for keyword in self.washing_keywords:
+            self.automaton.add_word(keyword, ("washing_machine", keyword))
+        for keyword in self.dishwasher_keywords:
+            self.automaton.add_word(keyword, ("dishwasher", keyword))
+        self.automaton.make_automaton()
 
     def detect(self, text: str) -> List[str]:
         """Return a list of devices matched in the input text."""
-        doc = self.nlp(text.lower())
+        return list(self._detect_cached(text.lower()))
+
+    def _detect(self, text: str) -> Tuple[str, ...]:
         found = set()
-        for match_id, start, end in self.matcher(doc):
-            label = self.nlp.vocab.strings[match_id]
-            if label == "WASHING_MACHINE":
-                found.add("washing_machine")
-            elif label == "DISHWASHER":
-                found.add("dishwasher")
-        return list(found)
+        for end, (label, keyword) in self.automaton.iter(text):
+            # Only whole-word hits count, like the token-based matcher:
+            # "washer" inside "dishwasher" must not match
+            start = end - len(keyword) + 1
+            if start > 0 and _WORD_RE.match(text[start - 1]):
+                continue
+            if end + 1 < len(text) and _WORD_RE.match(text[end + 1]):
+                continue
+            found.add(label)
+        return tuple(found)
@@ -0,0 +1,59 @@
+import os
+import sys
+import json
+from datetime import date, timedelta
+
+import requests
+
+BASE_PATH = os.path.normpath(
+    os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        '..',
+        'data'
+    )
+)
+
+
+class FeastTableGenerator:
+    """Walk orthocal.info once and persist the feast dates for a year."""
+
+    def __init__(self, year: int, output_path: str = None):
+        self.year = year
+        self.output_path = output_path or os.path.join(
+            BASE_PATH,
+            f"orthodox_feasts_{year}.json"
+        )
+        self.session = requests.Session()
+
+    def run(self):
+        print(f"🔄 Generating feast table for {self.year}...")
+
+        feasts = []
+        day = date(self.year, 1, 1)
+        while day.year == self.year:
+            url = (
+                "https://orthocal.info/api/gregorian/"
+                f"{day.year}/{day.month}/{day.day}"
+            )
+            try:
+                r = self.session.get(url, timeout=5)
+                js = r.json()
+                if js.get("feasts"):
+                    feasts.append(day.isoformat())
+            except Exception as e:
+                print(f"[Holiday] Error for {day.isoformat()}: {e}")
+            day += timedelta(days=1)
+
+        with open(self.output_path, "w", encoding="utf-8") as f:
+            json.dump(feasts, f, indent=2)
+
+        print(f"✅ JSON generated: {self.output_path}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: python generate_feast_table.py <year>")
+        sys.exit(1)
+
+    generator = FeastTableGenerator(int(sys.argv[1]))
+    generator.run()
@@ -1,9 +1,15 @@
 import os
-import json
+import atexit
+import threading
+import orjson
+from collections import deque
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 from pydantic import BaseModel
 
+# Seconds between a buffered record and its flush to disk
+FLUSH_INTERVAL = 1.0
+
 
 class CommandHistoryRecord(BaseModel):
     timestamp: datetime
@@ -27,26 +33,53 @@ class CommandHistoryManager:
         default_path = os.path.join(data_dir, 'command_history.jsonl')
         self.path = path or default_path
         os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._buf: deque = deque()
+        self._flush_lock = threading.Lock()
+        self._flush_timer: Optional[threading.Timer] = None
+        atexit.register(self.flush)
 
     def save(self, command: str, devices: List[str]) -> None:
-        """Save a new command record to the JSONL file."""
+        """Buffer a new command record for the JSONL file."""
         try:
             record = CommandHistoryRecord.new(command, devices)
-            with open(self.path, 'a', encoding='utf-8') as f:
-                # use Pydantic v2 model_dump() instead of deprecated dict()
-                json.dump(record.model_dump(), f, default=str)
-                f.write("\n")
+            # orjson serializes datetimes natively in C
+            self._buf.append(orjson.dumps(record.model_dump()) + b"\n")
+            self._schedule_flush()
         except Exception as e:
             print(f"⚠️ Error saving command: {e}")
 
+    def _schedule_flush(self) -> None:
+        with self._flush_lock:
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(FLUSH_INTERVAL, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+    def flush(self) -> None:
+        """Write all buffered records to disk in one append."""
+        with self._flush_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            pending = []
+            while self._buf:
+                pending.append(self._buf.popleft())
+        if not pending:
+            return
+        try:
+            with open(self.path, 'ab') as f:
+                f.write(b"".join(pending))
+        except Exception as e:
+            print(f"⚠️ Error flushing command history: {e}")
+
     def load_commands(self) -> List[CommandHistoryRecord]:
         """Load all command records from the JSONL file."""
-        records = []
+        self.flush()
         try:
-            with open(self.path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    data = json.loads(line)
-                    records.append(CommandHistoryRecord(**data))
+            with open(self.path, 'rb') as f:
+                return [
+                    CommandHistoryRecord.model_validate(orjson.loads(line))
+                    for line in f
+                ]
         except FileNotFoundError:
-            pass
-        return records
+            return []
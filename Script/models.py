@@ -22,7 +22,7 @@ class AIResponse(BaseModel):
     devices: List[str]
     patterns_per_day: Dict[str, Any]
     statistics: Dict[str, Any]
-    error_messages: List[str]
+    error_messages: Dict[str, List[str]]
     bonus_threshold: float
 
 
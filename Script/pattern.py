@@ -1,6 +1,7 @@
 # pattern analysis module
 import os
 import json
+import functools
 import pandas as pd
 from typing import Optional, List, Dict
 from pydantic import BaseModel, Field
@@ -16,6 +17,19 @@ BASE_PATH = os.path.normpath(
 )
 
 
+# Caches keyed on (path, mtime): unchanged files are served from
+# memory, modified files re-parse under a new key
+@functools.lru_cache(maxsize=32)
+def _read_cycles_cached(path: str, mtime: float) -> pd.DataFrame:
+    return pd.read_csv(path, parse_dates=["start"])
+
+
+@functools.lru_cache(maxsize=32)
+def _read_stats_cached(path: str, mtime: float) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
 class PatternFileManager:
     def __init__(self, base_path: str = BASE_PATH):
         self.base_path = base_path
@@ -32,16 +46,15 @@ class PatternFileManager:
         path = self.get_csv_path(device)
         if not os.path.exists(path) or os.path.getsize(path) == 0:
             return None
-        return pd.read_csv(path, parse_dates=["start"])
+        return _read_cycles_cached(path, os.path.getmtime(path))
 
     def load_stats(self, device: str) -> Optional[dict]:
         path = self.get_json_path(device)
         if not os.path.exists(path):
             return None
-        with open(path, encoding="utf-8") as f:
-            js = json.load(f)
-            # Stats key may be device or prefixed
-            return js.get(device) or js.get(f"consumption_{device}")
+        js = _read_stats_cached(path, os.path.getmtime(path))
+        # Stats key may be device or prefixed
+        return js.get(device) or js.get(f"consumption_{device}")
 
 
 class AnalyzedDevice(BaseModel):
@@ -75,40 +88,21 @@ class PatternExtractor:
         if df.empty:
             return {}
 
-        df = self._add_day_hour_columns(df)
-        total_pe_zi = self._calculate_totals(df)
-        if not total_pe_zi:
-            return {}
-
-        pattern = self._build_patterns(df, total_pe_zi)
-        return self._sort_by_day(pattern)
+        # One pass over the frame: cycle counts per (day, hour)
+        day = df["start"].dt.day_name().str.lower().rename("day")
+        hour = df["start"].dt.hour.rename("hour")
+        counts = df.groupby([day, hour]).size().unstack(fill_value=0)
 
-    def _add_day_hour_columns(self, df: pd.DataFrame) -> pd.DataFrame:
-        df["day"] = df["start"].dt.day_name().str.lower()
-        df["hour"] = df["start"].dt.hour
-        return df
-
-    def _calculate_totals(self, df: pd.DataFrame) -> Dict:
-        return {
-            day: len(df[df["day"] == day])
-            for day in df["day"].unique()
-            if not df[df["day"] == day].empty
-        }
-
-    def _build_patterns(
-        self,
-        df: pd.DataFrame,
-        total_pe_zi: dict
-    ) -> dict:
         pattern = {}
-        for day in total_pe_zi:
-            subset = df[df["day"] == day]
-            cnt = subset["hour"].value_counts()
+        for day_name, row in counts.iterrows():
+            cnt = row[row > 0]
             if cnt.empty:
                 continue
-            pattern_day = PatternPerDay.from_counts(day, cnt, total_pe_zi[day])
-            pattern[day] = pattern_day.dict()
-        return pattern
+            pattern_day = PatternPerDay.from_counts(
+                day_name, cnt, int(row.sum())
+            )
+            pattern[day_name] = pattern_day.dict()
+        return self._sort_by_day(pattern)
 
     def _sort_by_day(self, pattern: dict) -> dict:
         return dict(
@@ -2,18 +2,47 @@ import os
 import numpy as np
 import pandas as pd
 import joblib
-from itertools import product
-from sklearn.ensemble import GradientBoostingClassifier
+from sklearn.ensemble import HistGradientBoostingClassifier
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, confusion_matrix
 
+try:
+    import lz4  # noqa: F401
+    _JOBLIB_COMPRESS = ("lz4", 3)
+except ImportError:
+    # Uncompressed beats the zlib default for load latency too
+    _JOBLIB_COMPRESS = 0
+
+
+# Circular features for the whole 24x7 (hour, weekday) domain,
+# indexed by hour * 7 + weekday — computed once at import
+_IDX = np.arange(168)
+_HOURS = _IDX // 7
+_WEEKDAYS = _IDX % 7
+CIRCULAR_FEATURES = np.column_stack([
+    np.sin(2 * np.pi * _HOURS / 24),
+    np.cos(2 * np.pi * _HOURS / 24),
+    np.sin(2 * np.pi * _WEEKDAYS / 7),
+    np.cos(2 * np.pi * _WEEKDAYS / 7)
+])
+
+FEATURE_COLUMNS = ["hour_sin", "hour_cos", "weekday_sin", "weekday_cos"]
+
 
 class DataLoader:
     def __init__(self, csv_path: str):
         self.csv_path = csv_path
 
     def load_dataframe(self) -> pd.DataFrame:
-        return pd.read_csv(self.csv_path, parse_dates=["start"])
+        try:
+            return pd.read_csv(
+                self.csv_path, parse_dates=["start"], engine="pyarrow"
+            )
+        except (ImportError, ValueError):
+            # Fall back to the C engine with cached date parsing
+            return pd.read_csv(
+                self.csv_path, parse_dates=["start"], cache_dates=True
+            )
 
     def extract_device_name(self) -> str:
         filename = os.path.basename(self.csv_path)
@@ -35,10 +64,10 @@ class LabelGenerator:
 class Combinator:
     @staticmethod
     def all_combinations() -> pd.DataFrame:
-        return pd.DataFrame(
-            list(product(range(24), range(7))),
-            columns=["hour", "weekday"]
-        )
+        # Same order as product(range(24), range(7)), without
+        # building 168 Python tuples
+        idx = np.arange(168)
+        return pd.DataFrame({"hour": idx // 7, "weekday": idx % 7})
 
 
 class LabelMerger:
@@ -47,39 +76,47 @@ class LabelMerger:
         all_df: pd.DataFrame,
         positive_df: pd.DataFrame
     ) -> pd.DataFrame:
-        all_df["label"] = all_df.apply(
-            lambda row: 1 if (
-                (positive_df["hour"] == row["hour"]) &
-                (positive_df["weekday"] == row["weekday"])
-            ).any() else 0,
-            axis=1
-        )
+        # 168-slot bitset over the flattened (hour, weekday) domain
+        mask = np.zeros(168, dtype=np.uint8)
+        positive_keys = (
+            positive_df["hour"].to_numpy() * 7
+            + positive_df["weekday"].to_numpy()
+        ).astype(np.intp)
+        mask[positive_keys] = 1
+        all_keys = (
+            all_df["hour"].to_numpy() * 7
+            + all_df["weekday"].to_numpy()
+        ).astype(np.intp)
+        all_df["label"] = mask[all_keys]
         return all_df
 
 
 class FeatureEngineer:
     @staticmethod
     def add_circular_features(df: pd.DataFrame) -> pd.DataFrame:
-        df["hour_sin"] = np.sin(2 * np.pi * df["hour"] / 24)
-        df["hour_cos"] = np.cos(2 * np.pi * df["hour"] / 24)
-        df["weekday_sin"] = np.sin(2 * np.pi * df["weekday"] / 7)
-        df["weekday_cos"] = np.cos(2 * np.pi * df["weekday"] / 7)
+        idx = (
+            df["hour"].to_numpy() * 7 + df["weekday"].to_numpy()
+        ).astype(np.intp)
+        features = CIRCULAR_FEATURES[idx]
+        df["hour_sin"] = features[:, 0]
+        df["hour_cos"] = features[:, 1]
+        df["weekday_sin"] = features[:, 2]
+        df["weekday_cos"] = features[:, 3]
         return df
 
 
 class DataSplitter:
     @staticmethod
     def split(df: pd.DataFrame):
-        features = ["hour_sin", "hour_cos", "weekday_sin", "weekday_cos"]
-        X = df[features]
+        X = df[FEATURE_COLUMNS]
         y = df["label"]
         return train_test_split(X, y, test_size=0.2, random_state=42)
 
 
 class ModelBuilder:
     def __init__(self):
-        self.model = GradientBoostingClassifier(
-            n_estimators=100,
+        self.model = HistGradientBoostingClassifier(
+            max_iter=100,
             learning_rate=0.1,
             random_state=42
         )
@@ -118,8 +155,15 @@ class Evaluator:
 
 class ModelSaver:
     @staticmethod
-    def save(model, path: str):
-        joblib.dump(model, path)
+    def save(model, habit_map, path: str):
+        # Persist the precomputed habit map next to the estimator so
+        # inference can answer habit queries without a predict call
+        joblib.dump(
+            {"model": model, "habit_map": habit_map},
+            path,
+            compress=_JOBLIB_COMPRESS,
+            protocol=5
+        )
         print(f"💾 Model saved: {path}")
 
 
@@ -157,8 +201,12 @@ class RecommendationModelTrainer:
         Evaluator.report_label_distribution(features["label"])
         Evaluator.report_prediction_distribution(y_pred)
 
-        # 7. Save model
-        ModelSaver.save(builder.get_model(), self.model_output)
+        # 7. Evaluate the full 168-point domain once and save;
+        # wrap the LUT in a DataFrame so the fitted feature names
+        # line up and sklearn raises no warning
+        domain = pd.DataFrame(CIRCULAR_FEATURES, columns=FEATURE_COLUMNS)
+        habit_map = builder.predict(domain).astype(np.uint8)
+        ModelSaver.save(builder.get_model(), habit_map, self.model_output)
 
 
 if __name__ == "__main__":
@@ -3,9 +3,10 @@ import json
 import joblib
 import pandas as pd
 import numpy as np
-import calendar
+from datetime import date
 from typing import List, Tuple
 from models import Recommendation
+from recommendation_trainer import CIRCULAR_FEATURES, FEATURE_COLUMNS
 
 
 class SolarProductionReader:
@@ -14,23 +15,46 @@ class SolarProductionReader:
 
     def read(self) -> pd.DataFrame:
         try:
-            df = pd.read_csv(self.path, parse_dates=["time"])
+            try:
+                df = pd.read_csv(
+                    self.path, parse_dates=["time"], engine="pyarrow"
+                )
+            except (ImportError, ValueError):
+                # Fall back to the C engine with cached date parsing
+                df = pd.read_csv(
+                    self.path, parse_dates=["time"], cache_dates=True
+                )
             return df.dropna()
         except Exception as e:
             print(f"⚠️ Error reading CSV: {e}")
             return pd.DataFrame()
 
 
+# Window bounds only move at midnight, so cache them per calendar day
+_WINDOW_CACHE: dict = {}
+
+
+def _seven_day_bounds() -> Tuple[np.datetime64, np.datetime64]:
+    today = date.today()
+    bounds = _WINDOW_CACHE.get(today)
+    if bounds is None:
+        _WINDOW_CACHE.clear()
+        t0 = np.datetime64(today)
+        bounds = (t0, t0 + np.timedelta64(7, "D"))
+        _WINDOW_CACHE[today] = bounds
+    return bounds
+
+
 class FilteredProduction:
     def __init__(self, dataframe: pd.DataFrame):
         self.df = dataframe
 
     def keep_7_day_interval(self) -> pd.DataFrame:
-        today = pd.Timestamp.now().normalize()
-        return self.df[
-            (self.df["time"] >= today) &
-            (self.df["time"] < today + pd.Timedelta(days=7))
-        ]
+        # Compare on the raw datetime64 buffer; no .dt accessor or
+        # Python object materialization
+        t0, t1 = _seven_day_bounds()
+        arr = self.df["time"].values
+        return self.df[(arr >= t0) & (arr < t1)]
 
 
 BASE_PATH = os.path.normpath(
@@ -40,6 +64,12 @@ BASE_PATH = os.path.normpath(
     )
 )
 
+_DAY_NAMES = (
+    "monday", "tuesday", "wednesday", "thursday",
+    "friday", "saturday", "sunday"
+)
+_DAY_INDEX = {name: i for i, name in enumerate(_DAY_NAMES)}
+
 
 class DeviceHabitModel:
     def __init__(self, device: str):
@@ -48,36 +78,72 @@ class DeviceHabitModel:
             BASE_PATH,
             f"recommendation_model_{device}.pkl"
         )
+        self._model = None
+        self._habit_map = None
+
+    def _load(self):
+        # Deserialize the pickle once and reuse it for every lookup
+        if self._model is None:
+            data = joblib.load(self.path)
+            if isinstance(data, dict):
+                self._model = data["model"]
+                self._habit_map = np.asarray(
+                    data["habit_map"], dtype=bool
+                )
+            else:
+                # Older pickles hold the bare estimator;
+                # derive the 168-entry map once at load time
+                self._model = data
+                domain = pd.DataFrame(
+                    CIRCULAR_FEATURES, columns=FEATURE_COLUMNS
+                )
+                self._habit_map = data.predict(domain) == 1
+
+    def habit_map(self) -> np.ndarray:
+        """168-entry habit bitmap indexed by hour * 7 + weekday."""
+        try:
+            self._load()
+            return self._habit_map
+        except Exception:
+            return np.zeros(168, dtype=bool)
 
     def _hour_and_day_to_features(
         self,
         hour: int,
         weekday: int
-    ) -> pd.DataFrame:
-        df = pd.DataFrame([[hour, weekday]], columns=["hour", "weekday"])
-        df["hour_sin"] = np.sin(2 * np.pi * df["hour"] / 24)
-        df["hour_cos"] = np.cos(2 * np.pi * df["hour"] / 24)
-        df["weekday_sin"] = np.sin(2 * np.pi * df["weekday"] / 7)
-        df["weekday_cos"] = np.cos(2 * np.pi * df["weekday"] / 7)
-        return df[["hour_sin", "hour_cos", "weekday_sin", "weekday_cos"]]
+    ) -> np.ndarray:
+        # (1, 4) slice of the precomputed table; sklearn-compatible
+        # shape with no DataFrame construction
+        idx = hour * 7 + weekday
+        return CIRCULAR_FEATURES[idx:idx + 1]
 
     def is_habit(self, hour_str: str, day_str: str) -> bool:
         try:
             hour_int = int(hour_str.split(":")[0])
-            weekday_map = {
-                d.lower(): i
-                for i, d in enumerate(calendar.day_name)
-            }
-            weekday_int = weekday_map.get(day_str.lower(), -1)
+            weekday_int = _DAY_INDEX.get(day_str.lower(), -1)
             if weekday_int == -1:
                 return False
-            model = joblib.load(self.path)
-            X = self._hour_and_day_to_features(hour_int, weekday_int)
-            return model.predict(X)[0] == 1
+            return bool(self.habit_map()[hour_int * 7 + weekday_int])
         except Exception:
             return False
 
 
+# Parsed stats dicts keyed by path; entries stay valid while the
+# file's mtime is unchanged
+_STATS_CACHE: dict = {}
+
+
+def _load_stats(path: str) -> dict:
+    st = os.stat(path)
+    entry = _STATS_CACHE.get(path)
+    if entry and entry[0] == st.st_mtime:
+        return entry[1]
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    _STATS_CACHE[path] = (st.st_mtime, data)
+    return data
+
+
 class HistoricConsumption:
     def __init__(self, devices: List[str]):
         self.devices = devices
@@ -92,17 +158,13 @@ class HistoricConsumption:
                 f"consumption_{d}_ai_stats.json"
             )
             try:
-                if os.path.exists(stats_path):
-                    with open(stats_path, encoding="utf-8") as f:
-                        stats = json.load(f)
-                        entry = (
-                            stats.get(d)
-                            or stats.get(f"consumption_{d}")
-                            or {}
-                        )
-                        total += entry.get("avg_energy_kwh", 0.5)
-                else:
-                    total += 0.5
+                stats = _load_stats(stats_path)
+                entry = (
+                    stats.get(d)
+                    or stats.get(f"consumption_{d}")
+                    or {}
+                )
+                total += entry.get("avg_energy_kwh", 0.5)
             except Exception:
                 total += 0.5
         return total
@@ -113,17 +175,24 @@ class RecommendationScoreCalculator:
         self.models = [DeviceHabitModel(d) for d in devices]
 
     def weekday_name(self, dt) -> str:
-        return calendar.day_name[dt.weekday()].lower()
+        return _DAY_NAMES[dt.weekday()]
+
+    def habit_mask(self, times: pd.Series) -> np.ndarray:
+        """Rows where every device model predicts a habit."""
+        keys = times.dt.hour.to_numpy() * 7 + times.dt.weekday.to_numpy()
+        combined = np.ones(168, dtype=bool)
+        for model in self.models:
+            combined &= model.habit_map()
+        return combined[keys]
 
-    def score(self, row, bonus_threshold: float) -> float:
-        hour_str = f"{int(row['hour']):02d}:00"
-        day_str = self.weekday_name(row["time"])
-        is_habit = all(
-            model.is_habit(hour_str, day_str) for model in self.models
+    def score(self, energy: np.ndarray, habit: np.ndarray,
+              bonus_threshold: float) -> np.ndarray:
+        """Vectorized score: habit hours above the threshold get a bonus."""
+        return np.where(
+            habit & (energy >= bonus_threshold),
+            energy + bonus_threshold,
+            energy
         )
-        if is_habit and row["energy_kwh"] >= bonus_threshold:
-            return float(row["energy_kwh"] + bonus_threshold)
-        return float(row["energy_kwh"])
 
 
 class RecommendationCreator:
@@ -132,19 +201,18 @@ class RecommendationCreator:
         self.scorer = RecommendationScoreCalculator(devices)
 
     def create(self, row) -> Recommendation:
-        hour_str = f"{row['time'].hour:02d}:00"
-        day_str = self.scorer.weekday_name(row["time"])
-        is_habit = all(
-            model.is_habit(hour_str, day_str) for model in self.scorer.models
-        )
+        hour_str = f"{row.time.hour:02d}:00"
+        day_str = self.scorer.weekday_name(row.time)
+        # Habit was already decided for the whole frame by the scorer
+        is_habit = bool(row.is_habit)
         rec = Recommendation(
-            date=str(row["time"].date()),
+            date=str(row.time.date()),
             time=hour_str,
             day=day_str,
-            energy=round(row["energy_kwh"], 2),
+            energy=round(row.energy_kwh, 2),
             habit=is_habit,
             controllable_devices=self.devices,
-            score=round(row.get("scor", row.get("energy_kwh")), 2)
+            score=round(row.scor, 2)
         )
         return rec
 
@@ -168,16 +236,25 @@ class RecommendationCalculator:
         total_consumption = HistoricConsumption(self.devices).calculate_total()
         threshold = total_consumption + self.bonus_reserve
         creator = RecommendationCreator(self.devices)
-        results = []
-        for _, group in df.groupby(df["time"].dt.date):
-            sub = group[group["energy_kwh"] >= threshold].copy()
-            if sub.empty:
-                continue
-            sub["scor"] = sub.apply(
-                lambda r: creator.scorer.score(r, threshold), axis=1
-            )
-            top = sub.nlargest(3, "scor")
-            for _, row in top.iterrows():
-                rec = creator.create(row)
-                results.append(rec.dict())
+
+        sub = df[df["energy_kwh"] >= threshold].copy()
+        if sub.empty:
+            return [], threshold
+        habit = creator.scorer.habit_mask(sub["time"])
+        sub["is_habit"] = habit
+        sub["scor"] = creator.scorer.score(
+            sub["energy_kwh"].to_numpy(), habit, threshold
+        )
+        # Top 3 per day via rank — no per-group Python callbacks
+        sub["date"] = sub["time"].values.astype("datetime64[D]")
+        rank = sub.groupby("date")["scor"].rank(
+            method="first", ascending=False
+        )
+        top = sub[rank <= 3].sort_values(
+            ["date", "scor"], ascending=[True, False]
+        )
+        results = [
+            creator.create(row).dict()
+            for row in top.itertuples(index=False)
+        ]
         return results, threshold
@@ -1,8 +1,15 @@
+import orjson
 import requests
+import numpy as np
 import pandas as pd
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone, tzinfo
 
+# Reuse one pooled session so repeated simulations skip the
+# TCP+TLS handshake, and ask for compressed responses
+_SESSION = requests.Session()
+_SESSION.headers.update({"Accept-Encoding": "gzip, deflate"})
+
 
 @dataclass
 class SolarProductionSimulation:
@@ -36,21 +43,22 @@ class SolarProductionSimulation:
         )
 
     def _filter_past_hours(self, df: pd.DataFrame) -> pd.DataFrame:
+        # The forecast rows are hour-aligned local times, so keeping
+        # rows strictly after the current (floored) hour is the same
+        # as the old date/hour comparison, in one datetime64 compare
         now = datetime.now(self.tz)
-        return df[
-            (df["time"].dt.date > now.date()) |
-            (
-                (df["time"].dt.date == now.date())
-                & (df["time"].dt.hour > now.hour)
-            )
-        ]
+        cutoff = np.datetime64(
+            now.replace(minute=0, second=0, microsecond=0, tzinfo=None)
+        )
+        return df[df["time"].values > cutoff]
 
     def run(self):
         print("🔄 Generating solar production simulation...")
 
         url = self._build_url()
-        response = requests.get(url)
-        data = response.json()
+        response = _SESSION.get(url, timeout=10)
+        response.raise_for_status()
+        data = orjson.loads(response.content)
 
         if (
             "hourly" not in data
@@ -63,12 +71,26 @@ class SolarProductionSimulation:
         df["time"] = pd.to_datetime(df["time"])
         df["hour"] = df["time"].dt.hour
 
-        total_area = self._calc_total_area()
+        # One multiply by a precomputed scalar — no intermediate arrays
+        coef = self._calc_total_area() * self.efficiency / 1000
         df["energy_kwh"] = (
-            df["global_tilted_irradiance"] * total_area * self.efficiency
-        ) / 1000
+            df["global_tilted_irradiance"].to_numpy(dtype=np.float64) * coef
+        )
 
         df = self._filter_past_hours(df)
-        df.to_csv(self.output_csv, index=False)
+        try:
+            import pyarrow as pa
+            import pyarrow.csv as pac
+            tbl = pa.Table.from_pandas(df, preserve_index=False)
+            # pandas timestamps are nanosecond precision; cast to whole
+            # seconds so the CSV carries no fractional part and the
+            # timestamp("s") reader in backend.py can parse it back
+            idx = tbl.schema.get_field_index("time")
+            tbl = tbl.set_column(
+                idx, "time", tbl.column(idx).cast(pa.timestamp("s"))
+            )
+            pac.write_csv(tbl, self.output_csv)
+        except ImportError:
+            df.to_csv(self.output_csv, index=False)
 
         print(f"✅ CSV generated: {self.output_csv}")